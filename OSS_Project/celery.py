@@ -0,0 +1,19 @@
+"""
+Celery config for OSS_Project project.
+
+It exposes the Celery app as a module-level variable named ``app``; start a
+worker with ``celery -A OSS_Project worker``.
+
+For more information on this file, see
+https://docs.celeryq.dev/en/stable/django/first-steps-with-django.html
+"""
+
+import os
+
+from celery import Celery
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'OSS_Project.settings')
+
+app = Celery('OSS_Project')
+app.config_from_object('django.conf:settings', namespace='CELERY')
+app.autodiscover_tasks()
@@ -21,5 +21,6 @@ from dashboard import views
 
 urlpatterns = [
     path("", views.dashboard_home, name="dashboard_home"),
+    path("api/metrics/<str:job_id>/", views.metrics_status, name="metrics_status"),
     path("admin/", admin.site.urls),
 ]
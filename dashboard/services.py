@@ -1,225 +1,575 @@
+import asyncio
+import math
 import os
-import statistics
-from datetime import datetime, timezone
-from github import Github, GithubException
+import re
+import time
+from bisect import bisect_right
+from datetime import datetime
+from urllib.parse import urlencode
+
+import httpx
+import msgspec
+import numpy as np
+import orjson
+from django.core.cache import cache
 from dotenv import load_dotenv
 
-# Load environment variables
+# Load environment variables once at import rather than on every request
 load_dotenv()
+GITHUB_TOKEN = os.getenv("GITHUB_TOKEN")
+
+GITHUB_API_URL = "https://api.github.com"
+GITHUB_GRAPHQL_URL = f"{GITHUB_API_URL}/graphql"
+
+# Metric coloring: (thresholds, colors) where a value below thresholds[i]
+# gets colors[i] and anything at or above the last threshold gets colors[-1].
+BUS_FACTOR_COLORS = ((3, 10), ("danger", "warning", "success"))  # Risk
+RESPONSE_TIME_COLORS = ((24, 72), ("success", "warning", "danger"))  # Hours
+LATENCY_COLORS = ((3, 7), ("success", "warning", "danger"))  # Days
+HEALTH_COLORS = ((50, 80), ("danger", "warning", "success"))  # Percentage
+ISSUE_AGE_COLORS = ((30, 90), ("success", "warning", "danger"))  # Days
+
+GITHUB_HEADERS = {"Accept": "application/vnd.github+json"}
+if GITHUB_TOKEN:
+    GITHUB_HEADERS["Authorization"] = f"Bearer {GITHUB_TOKEN}"
+
+# How many recent issues/PRs each metric is averaged over; GitHub returns
+# exactly this many nodes, so nothing is fetched only to be sliced away.
+SAMPLE_SIZE = 20
+
+# Caps in-flight requests per analysis to stay clear of GitHub's secondary rate limits
+MAX_CONCURRENT_REQUESTS = 10
+
+# Transient failures are retried with exponential backoff, capped per wait.
+# A server-sent Retry-After is honored in full; if it asks for longer than
+# MAX_RETRY_AFTER the request is given up on instead.
+MAX_ATTEMPTS = 6
+MAX_RETRY_DELAY = 32
+MAX_RETRY_AFTER = 60
+RETRY_STATUSES = (202, 500, 502, 503, 504)
+
+# How long REST bodies are kept for If-None-Match revalidation
+ETAG_CACHE_TTL_SECONDS = 60 * 60 * 24 * 7
+
+# Core requests kept in reserve; lower-priority REST metrics are skipped and
+# reported as RATE_LIMITED rather than spending them.
+RATE_LIMIT_RESERVE = 5
+RATE_LIMITED = "Rate-limited — try later"
+
+# Last core quota GitHub reported to this process, refreshed by every analysis
+_last_rate_limit = {"remaining": None, "reset": 0}
+
+# e.g. Link: <https://api.github.com/...&page=2>; rel="next", <...&page=412>; rel="last"
+_LINK_LAST_PAGE = re.compile(r'<[^<>]*[?&]page=(\d+)[^<>]*>;\s*rel="last"')
+
+# Everything the dashboard needs except the contributor statistics and
+# community profile, fetched in a single round trip (those are REST-only).
+REPO_HEALTH_QUERY = """
+query ($owner: String!, $name: String!, $sample: Int!) {
+  repository(owner: $owner, name: $name) {
+    nameWithOwner
+    stargazerCount
+    forkCount
+    pushedAt
+    licenseInfo { name }
+    primaryLanguage { name }
+    open_issue_count: issues(states: OPEN) { totalCount }
+    open_pull_count: pullRequests(states: OPEN) { totalCount }
+    issues_closed: issues(first: $sample, states: CLOSED, orderBy: {field: CREATED_AT, direction: DESC}) {
+      nodes { createdAt comments(first: 1) { nodes { createdAt } } }
+    }
+    issues_open: issues(first: $sample, states: OPEN, orderBy: {field: CREATED_AT, direction: DESC}) {
+      nodes { createdAt }
+    }
+    pulls_closed: pullRequests(first: $sample, states: [MERGED, CLOSED], orderBy: {field: CREATED_AT, direction: DESC}) {
+      nodes { createdAt mergedAt closedAt }
+    }
+  }
+}
+"""
+
+
+def _parse_datetime(value):
+    return datetime.fromisoformat(value) if value else None
+
+
+def _to_datetime64(timestamps):
+    # GitHub timestamps are always UTC ("...Z"); numpy parses them naive
+    return np.array([ts.rstrip("Z") for ts in timestamps], dtype="datetime64[s]")
+
+
+def _mean_seconds(deltas):
+    return float(deltas.astype(np.int64).mean())
+
 
+def _last_page(link_header):
+    """Returns the page number of the rel="last" URL in a Link header, or None."""
+    # GitHub lists rel="last" as the final entry, so try that segment first
+    match = _LINK_LAST_PAGE.search(link_header, link_header.rfind(",") + 1)
+    if match is None:
+        match = _LINK_LAST_PAGE.search(link_header)
+    return int(match.group(1)) if match else None
 
-def get_repo_health_metrics(repo_name):
+
+def _color(value, table):
+    """Maps a metric value onto a Bootstrap color; non-numeric values are "secondary"."""
+    if not isinstance(value, (int, float)):
+        return "secondary"
+    thresholds, colors = table
+    return colors[bisect_right(thresholds, value)]
+
+
+def _known_rate_limit_budget():
     """
-    Analyzes a GitHub repository and returns health metrics.
-    repo_name example: "django/django" or "torvalds/linux"
+    Core requests that can be spent without dipping into RATE_LIMIT_RESERVE,
+    or None when no quota has been observed since the last reset.
+    """
+    if (
+        _last_rate_limit["remaining"] is None
+        or time.time() >= _last_rate_limit["reset"]
+    ):
+        return None
+    return _last_rate_limit["remaining"] - RATE_LIMIT_RESERVE
+
+
+def _record_rate_limit(response):
+    """Tracks the core quota reported by a REST response in _last_rate_limit."""
+    if response.headers.get("X-RateLimit-Resource", "core") != "core":
+        return  # GraphQL points are budgeted separately
+    value = response.headers.get("X-RateLimit-Remaining")
+    if value is None:
+        return
+
+    remaining = int(value)
+    reset = int(response.headers.get("X-RateLimit-Reset", 0))
+    # Concurrent responses arrive out of order: a later reset starts a new
+    # window, otherwise the lowest count seen is the current one.
+    last = _last_rate_limit
+    if (
+        last["remaining"] is None
+        or reset > last["reset"]
+        or (reset == last["reset"] and remaining < last["remaining"])
+    ):
+        _last_rate_limit.update(remaining=remaining, reset=reset)
+
+
+def _should_retry(response):
+    if response.headers.get("X-RateLimit-Resource", "core") == "core":
+        # Every retry (e.g. re-polling a 202) spends another core request
+        budget = _known_rate_limit_budget()
+        if budget is not None and budget <= 0:
+            return False
+    if response.status_code in (403, 429):
+        # Only secondary rate limits carry Retry-After; a plain 403 is final
+        return "Retry-After" in response.headers
+    # 202: GitHub is still computing statistics, ask again shortly
+    return response.status_code in RETRY_STATUSES
+
+
+async def _request(client, semaphore, method, url, **kwargs):
     """
+    Sends a request, retrying transient failures with exponential backoff
+    (1, 2, 4, 8, 16s) or for as long as Retry-After asks. The last response
+    or transport error is returned/raised once MAX_ATTEMPTS is reached or
+    Retry-After exceeds MAX_RETRY_AFTER.
+    """
+    for attempt in range(MAX_ATTEMPTS):
+        final_attempt = attempt == MAX_ATTEMPTS - 1
+        try:
+            async with semaphore:
+                response = await client.request(method, url, **kwargs)
+            _record_rate_limit(response)
+        except httpx.TransportError:
+            if final_attempt:
+                raise
+            delay = min(2**attempt, MAX_RETRY_DELAY)
+        else:
+            if final_attempt or not _should_retry(response):
+                return response
+            if "Retry-After" in response.headers:
+                delay = int(response.headers["Retry-After"])
+                if delay > MAX_RETRY_AFTER:
+                    return response
+            else:
+                delay = min(2**attempt, MAX_RETRY_DELAY)
 
-    # Initialize GitHub API with token
-    token = os.getenv("GITHUB_TOKEN")
-    g = Github(token)
+        # Sleep outside the semaphore so other requests can proceed
+        await asyncio.sleep(delay)
 
-    rate_limit = g.get_rate_limit()
 
-    try:
-        rate_limit_remaining = rate_limit.resources.core.remaining
-    except AttributeError:
-        # Fallback for unexpected structure
-        rate_limit_remaining = getattr(rate_limit.core, "remaining", 0)
+async def _fetch(client, semaphore, path, params=None):
+    """
+    GETs path conditionally: the ETag from the last 200 is sent back as
+    If-None-Match, and a 304 (which costs no quota) is answered with the
+    body cached alongside it.
+    """
+    cache_key = f"github_etag:{path}?{urlencode(params or {})}"
+    cached = await cache.aget(cache_key)
+    headers = {"If-None-Match": cached["etag"]} if cached else None
+
+    response = await _request(
+        client, semaphore, "GET", path, params=params, headers=headers
+    )
+
+    if response.status_code == 304 and cached:
+        # A 304 carries no pagination headers, so restore the cached Link
+        headers = httpx.Headers(response.headers)
+        if cached.get("link"):
+            headers["Link"] = cached["link"]
+        return httpx.Response(
+            200, headers=headers, content=cached["body"], request=response.request
+        )
+    if response.status_code == 200 and "ETag" in response.headers:
+        await cache.aset(
+            cache_key,
+            {
+                "etag": response.headers["ETag"],
+                "link": response.headers.get("Link"),
+                "body": response.content,
+            },
+            ETAG_CACHE_TTL_SECONDS,
+        )
+    return response
 
-    if rate_limit_remaining < 5:  # Halt if limit is nearly exhausted
-        return {
-            "error": f"API Rate Limit Warning: Only {rate_limit_remaining} requests remaining. Please wait one hour or provide a new token.",
-            "rate_limit_remaining": rate_limit_remaining,
-        }
 
-    try:
-        repo = g.get_repo(repo_name)
-    except GithubException as e:
-        error_msg = (
-            f"Repository not found, private, or unknown GitHub error: {e.status}"
+class Metrics(msgspec.Struct):
+    """
+    Health metrics for one repository. Metrics that could not be computed
+    hold a display string ("N/A", "Processing...", RATE_LIMITED).
+    """
+
+    repo_name: str
+    stars: int
+    forks: int
+    open_issues: int | str
+    rate_limit_remaining: int | None
+    language: str
+    license: str
+    last_commit_date: str = "N/A"
+    avg_response_time_hours: float | str = "N/A"
+    avg_issue_age_days: float | str = "N/A"
+    avg_pr_latency_days: float | str = "N/A"
+    total_contributors: int | str = "N/A"
+    bus_factor: int | str = "N/A"
+    health_percentage: int | str = 0
+    bus_factor_color: str = "secondary"
+    response_time_color: str = "secondary"
+    latency_color: str = "secondary"
+    health_color: str = "secondary"
+    age_color: str = "secondary"
+    # True when a sub-request failed transiently (skipped for quota, errored,
+    # 5xx after retries, still computing), so the result should not be cached
+    partial: bool = False
+
+
+class GraphQLError(Exception):
+    """A GraphQL response that carried errors and no repository data."""
+
+    def __init__(self, error_type, message, response):
+        super().__init__(message)
+        self.type = error_type
+        self.response = response
+
+
+async def gql_fetch(client, semaphore, repo_name):
+    """
+    Runs REPO_HEALTH_QUERY for repo_name and returns the repository node.
+    Raises GraphQLError when GitHub answers with errors and no repository
+    (e.g. NOT_FOUND or RATE_LIMITED). Partial data is returned as-is, with
+    the connections GitHub could not resolve left as null.
+    """
+    owner, _, name = repo_name.partition("/")
+    response = await _request(
+        client,
+        semaphore,
+        "POST",
+        GITHUB_GRAPHQL_URL,
+        json={
+            "query": REPO_HEALTH_QUERY,
+            "variables": {"owner": owner, "name": name, "sample": SAMPLE_SIZE},
+        },
+    )
+    response.raise_for_status()
+
+    body = orjson.loads(response.content)
+    repository = (body.get("data") or {}).get("repository")
+    if repository is None:
+        # GitHub answers 200 even for missing repositories and exhausted quota
+        error = (body.get("errors") or [{}])[0]
+        raise GraphQLError(
+            error.get("type", "NOT_FOUND"), error.get("message", ""), response
         )
-        return {"error": error_msg, "rate_limit_remaining": rate_limit_remaining}
+    return repository
 
-    # Data Container (Updated with all new metrics)
-    metrics = {
-        "repo_name": repo.full_name,
-        "stars": repo.stargazers_count,
-        "forks": repo.forks_count,
-        "open_issues": repo.open_issues_count,
-        "avg_response_time_hours": "N/A",
-        "avg_pr_latency_days": "N/A",
-        "total_contributors": "N/A",
-        "bus_factor": "N/A",
-        "rate_limit_remaining": rate_limit_remaining,
-        "last_commit_date": "N/A",
-        "avg_issue_age_days": "N/A",
-        "health_percentage": 0,
-        "language": repo.language or "N/A",
-        "license": repo.license.name if repo.license else "Unspecified",
-        "bus_factor_color": "secondary",
-        "response_time_color": "secondary",
-        "latency_color": "secondary",
-        "health_color": "secondary",
-        "age_color": "secondary",
-    }
 
-    if repo.pushed_at:
-        metrics["last_commit_date"] = repo.pushed_at.strftime("%b %d, %Y")
+def _nodes(repo, connection):
+    """
+    Returns the nodes of a connection in a repository query result, or None
+    if GitHub could not resolve it (partial data comes back as null).
+    """
+    nodes = (repo.get(connection) or {}).get("nodes")
+    if nodes is None:
+        return None
+    return [node for node in nodes if node]
+
+
+def _is_transient_failure(result):
+    """True for a REST sub-request that was skipped, errored, or not yet answered."""
+    if result is None or isinstance(result, Exception):
+        return True
+    return (
+        result.status_code in RETRY_STATUSES
+        or result.status_code == 429
+        or "Retry-After" in result.headers
+    )
+
+
+def _open_issues(repo):
+    # Matches the REST open_issues_count, which also counts open PRs
+    issues, pulls = repo.get("open_issue_count"), repo.get("open_pull_count")
+    if issues is None or pulls is None:
+        return "N/A"
+    return issues["totalCount"] + pulls["totalCount"]
+
+
+def _is_rate_limited(result):
+    """True for a response (or raised error) rejected for lack of quota."""
+    if isinstance(result, GraphQLError):
+        return result.type == "RATE_LIMITED"
+    if isinstance(result, httpx.HTTPStatusError):
+        result = result.response
+    if not isinstance(result, httpx.Response):
+        return False
+    return (
+        result.status_code in (403, 429)
+        and result.headers.get("X-RateLimit-Remaining") == "0"
+    )
+
+
+async def get_repo_health_metrics(repo_name):
+    """
+    Analyzes a GitHub repository and returns its Metrics, or a dict with
+    an "error" message if the repository could not be analyzed.
+    repo_name example: "django/django" or "torvalds/linux"
+    """
 
-    # --- METRIC 1: Response Time (Time to first comment on Issues) ---
-    issues_closed = repo.get_issues(state="closed", sort="created", direction="desc")[
-        :20
-    ]
-    response_times = []
+    if not GITHUB_TOKEN:
+        # GitHub's GraphQL API does not accept anonymous requests
+        return {
+            "error": "A GitHub token is required: set GITHUB_TOKEN in your environment or .env file.",
+            "rate_limit_remaining": None,
+        }
 
-    for issue in issues_closed:
-        if issue.pull_request:
-            continue
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+
+    # One client per analysis: every sub-request shares its connection pool,
+    # multiplexed over a single HTTP/2 connection to api.github.com. REST
+    # paths of renamed or transferred repositories answer with a 301.
+    async with httpx.AsyncClient(
+        base_url=GITHUB_API_URL,
+        headers=GITHUB_HEADERS,
+        http2=True,
+        timeout=10,
+        follow_redirects=True,
+    ) as client:
+        # REST-only metrics in priority order, each costing at least one core
+        # request. When the known budget is tight the lower-priority ones are
+        # skipped, and retries stop once only the reserve is left.
+        rest_requests = [
+            (f"/repos/{repo_name}/stats/contributors", None),
+            # One contributor per page, so the last page number is the total
+            (f"/repos/{repo_name}/contributors", {"per_page": 1}),
+            (f"/repos/{repo_name}/community/profile", None),
+        ]
+        budget = _known_rate_limit_budget()
+        if budget is not None:
+            rest_requests = rest_requests[: max(0, budget)]
+
+        # The GraphQL query and the REST-only endpoints are independent, so
+        # issue them concurrently; failures come back as exception objects.
+        repo, *rest = await asyncio.gather(
+            gql_fetch(client, semaphore, repo_name),
+            *(
+                _fetch(client, semaphore, path, params)
+                for path, params in rest_requests
+            ),
+            return_exceptions=True,
+        )
 
-        comments = issue.get_comments()
-        if comments.totalCount > 0:
-            first_comment = comments[0]
-            delta = first_comment.created_at - issue.created_at
-            response_times.append(delta.total_seconds())
+    # Skipped or quota-rejected requests are reported as None
+    stats, contributors, community = [
+        None if result is None or _is_rate_limited(result) else result
+        for result in rest + [None] * (3 - len(rest))
+    ]
 
-    if response_times:
-        avg_seconds = statistics.mean(response_times)
-        metrics["avg_response_time_hours"] = round(avg_seconds / 3600, 2)
+    # GitHub reports the remaining quota on every response and _request
+    # records it, so no request is spent on /rate_limit.
+    rate_limit_remaining = _last_rate_limit["remaining"]
 
-    issues_open = repo.get_issues(state="open", sort="created", direction="desc")
-    issue_ages = []
-    now = datetime.now(timezone.utc)
+    if _is_rate_limited(repo):
+        # Only the repository query is essential; everything else degrades
+        reset = int(repo.response.headers.get("X-RateLimit-Reset", 0))
+        wait_minutes = max(1, math.ceil((reset - time.time()) / 60))
+        return {
+            "error": f"API Rate Limit Warning: GitHub's request quota is exhausted. Please wait {wait_minutes} minutes or provide a new token.",
+            "rate_limit_remaining": rate_limit_remaining,
+        }
 
-    for issue in issues_open:
-        if issue.pull_request:
-            continue
-        delta = now - issue.created_at
-        issue_ages.append(delta.total_seconds())
+    if isinstance(repo, httpx.HTTPStatusError):
+        error_msg = f"Repository not found, private, or unknown GitHub error: {repo.response.status_code}"
+        return {"error": error_msg, "rate_limit_remaining": rate_limit_remaining}
+    if isinstance(repo, GraphQLError):
+        if repo.type == "NOT_FOUND":
+            error_msg = "Repository not found, private, or unknown GitHub error: 404"
+        else:
+            error_msg = (
+                f"Repository not found, private, or unknown GitHub error: {repo.type}"
+            )
+        return {"error": error_msg, "rate_limit_remaining": rate_limit_remaining}
+    if isinstance(repo, Exception):
+        return {
+            "error": f"Unable to reach GitHub: {repo}",
+            "rate_limit_remaining": rate_limit_remaining,
+        }
 
-    if issue_ages:
-        avg_seconds = statistics.mean(issue_ages)
-        metrics["avg_issue_age_days"] = round(avg_seconds / 86400, 1)
+    # Data Container (Updated with all new metrics)
+    metrics = Metrics(
+        repo_name=repo["nameWithOwner"],
+        stars=repo["stargazerCount"],
+        forks=repo["forkCount"],
+        open_issues=_open_issues(repo),
+        rate_limit_remaining=rate_limit_remaining,
+        language=(repo["primaryLanguage"] or {}).get("name") or "N/A",
+        license=(repo["licenseInfo"] or {}).get("name") or "Unspecified",
+    )
+
+    if repo["pushedAt"]:
+        metrics.last_commit_date = _parse_datetime(repo["pushedAt"]).strftime(
+            "%b %d, %Y"
+        )
 
-    # --- METRIC 2: Review Latency (Time to Merge/Close PRs) ---
-    pulls = repo.get_pulls(state="closed", sort="created", direction="desc")[:20]
-    pr_latencies = []
+    # --- METRIC 1: Response Time (Time to first comment on Issues) ---
+    # GraphQL issues never include pull requests, and the first comment
+    # comes back inline instead of costing one request per issue.
+    issues_closed = _nodes(repo, "issues_closed")
+    answered = [i for i in issues_closed or [] if (i["comments"] or {}).get("nodes")]
+
+    if answered:
+        created = _to_datetime64(i["createdAt"] for i in answered)
+        first_comment = _to_datetime64(
+            i["comments"]["nodes"][0]["createdAt"] for i in answered
+        )
+        avg_seconds = _mean_seconds(first_comment - created)
+        metrics.avg_response_time_hours = round(avg_seconds / 3600, 2)
 
-    for pr in pulls:
-        end_time = pr.merged_at if pr.merged else pr.closed_at
+    issues_open = _nodes(repo, "issues_open")
 
-        if end_time:
-            delta = end_time - pr.created_at
-            pr_latencies.append(delta.total_seconds())
+    if issues_open:
+        now = np.datetime64("now", "s")
+        created = _to_datetime64(i["createdAt"] for i in issues_open)
+        avg_seconds = _mean_seconds(now - created)
+        metrics.avg_issue_age_days = round(avg_seconds / 86400, 1)
 
-    if pr_latencies:
-        avg_seconds = statistics.mean(pr_latencies)
-        metrics["avg_pr_latency_days"] = round(avg_seconds / 86400, 2)
+    # --- METRIC 2: Review Latency (Time to Merge/Close PRs) ---
+    pulls = [
+        pr
+        for pr in _nodes(repo, "pulls_closed") or []
+        if pr["mergedAt"] or pr["closedAt"]
+    ]
 
-    # --- METRIC 3 & 4: Contributor Sustainability (Bus Factor) ---
-    try:
-        # Get Total Contributors
-        metrics["total_contributors"] = repo.get_contributors().totalCount
+    if pulls:
+        created = _to_datetime64(pr["createdAt"] for pr in pulls)
+        ended = _to_datetime64(pr["mergedAt"] or pr["closedAt"] for pr in pulls)
+        avg_seconds = _mean_seconds(ended - created)
+        metrics.avg_pr_latency_days = round(avg_seconds / 86400, 2)
 
+    # --- METRIC 3 & 4: Contributor Sustainability (Bus Factor) ---
+    # Get Total Contributors
+    if contributors is None:
+        metrics.total_contributors = RATE_LIMITED
+    elif isinstance(contributors, Exception):
+        pass  # Leave the total as "N/A"
+    elif contributors.status_code == 200:
+        last_page = _last_page(contributors.headers.get("Link", ""))
+        if last_page:
+            metrics.total_contributors = last_page
+        else:
+            metrics.total_contributors = len(orjson.loads(contributors.content))
+    elif contributors.status_code == 204:
+        metrics.total_contributors = 0  # Empty repository
+
+    if stats is None:
+        metrics.bus_factor = RATE_LIMITED
+    elif isinstance(stats, Exception):
+        pass  # Leave the bus factor as "N/A"
+    elif stats.status_code == 202:
+        # GitHub is still computing the statistics even after re-polling
+        metrics.bus_factor = "Processing..."
+    elif stats.status_code == 200:
         # Get weekly contributor statistics (includes additions)
-        contributor_stats = repo.get_stats_contributors()
-
-        # 1. Calculate total additions for the entire repository
-        total_additions = sum(
-            week.a for contributor in contributor_stats for week in contributor.weeks
+        # This payload is one row per contributor x every week of history,
+        # often several MB on large repositories, so decode it with orjson.
+        contributor_stats = orjson.loads(stats.content) or []
+
+        # 1. Sum each contributor's weekly additions into one int64 array.
+        # Rows are summed individually since GitHub does not guarantee they
+        # all span the same weeks. Deleted ("ghost") accounts count toward
+        # the total but not as authors.
+        additions = np.fromiter(
+            (sum(week["a"] for week in c["weeks"]) for c in contributor_stats),
+            dtype=np.int64,
+            count=len(contributor_stats),
         )
 
-        # 2. Compile each contributor's total additions
-        contributor_additions = []
-        for contributor in contributor_stats:
-            if contributor.author:
-                total_contributor_additions = sum(week.a for week in contributor.weeks)
-                contributor_additions.append(total_contributor_additions)
+        total_additions = int(additions.sum())
+        has_author = np.array(
+            [bool(c["author"]) for c in contributor_stats], dtype=bool
+        )
+        contributor_additions = additions[has_author]
 
         # Sort contributions descending to find the top authors
-        contributor_additions.sort(reverse=True)
+        top_additions = np.sort(contributor_additions)[::-1]
 
-        # 3. Calculate Bus Factor (minimum contributors for 50% of additions)
-        target_additions = total_additions * 0.50
-        cumulative_additions = 0
-        bus_factor = 0
+        # 2. Calculate Bus Factor (minimum contributors for 50% of additions):
+        # the first position where the running total reaches the target.
+        cumulative_additions = np.cumsum(top_additions)
+        bus_factor = (
+            int(np.searchsorted(cumulative_additions, total_additions * 0.50)) + 1
+        )
 
-        for additions in contributor_additions:
-            cumulative_additions += additions
-            bus_factor += 1
-            if cumulative_additions >= target_additions:
-                metrics["bus_factor"] = bus_factor
-                break
+        if bus_factor <= len(cumulative_additions):
+            metrics.bus_factor = bus_factor
 
         # If total_additions is 0 (new repo), set to 1
         if total_additions == 0:
-            metrics["bus_factor"] = 1
-
-    except GithubException as e:
-        if e.status == 202:
-            metrics["bus_factor"] = "Processing..."
-            metrics["total_contributors"] = "Processing..."
-        else:
-            # Handle other GitHubExceptions
-            metrics["bus_factor"] = "N/A"
-            metrics["total_contributors"] = "N/A"
+            metrics.bus_factor = 1
 
-    try:
-        # Fetching community profile metrics
-        community_profile = repo.get_community_profile()
+    if community is None:
+        metrics.health_percentage = RATE_LIMITED
+    elif not isinstance(community, Exception) and community.status_code == 200:
         # The API returns an int score (e.g., 50 for 50%).
-        metrics["health_percentage"] = community_profile.health_percentage or 0
-    except Exception:
-        metrics["health_percentage"] = (
-            0  # Default to 0 if API fails or profile is missing
+        metrics.health_percentage = (
+            orjson.loads(community.content).get("health_percentage") or 0
         )
 
-    # 1. Bus Factor Color
-    bus_factor_level = metrics["bus_factor"]
-    if isinstance(bus_factor_level, int):
-        if bus_factor_level < 3:
-            metrics["bus_factor_color"] = "danger"  # Red (High Risk)
-        elif bus_factor_level < 10:
-            metrics["bus_factor_color"] = "warning"  # Yellow (Moderate Risk)
-        else:
-            metrics["bus_factor_color"] = "success"  # Green (Low Risk)
-
-    # 2. Avg. Response Time Color (Hours)
-    response_time_level = metrics["avg_response_time_hours"]
-    if isinstance(response_time_level, (int, float)):
-        if response_time_level < 24:
-            metrics["response_time_color"] = "success"  # Green (Fast)
-        elif response_time_level < 72:
-            metrics["response_time_color"] = "warning"  # Yellow (Acceptable)
-        else:
-            metrics["response_time_color"] = "danger"  # Red (Slow)
-
-    # 3. Avg. Review Latency Color (Days)
-    latency_level = metrics["avg_pr_latency_days"]
-    if isinstance(latency_level, (int, float)):
-        if latency_level < 3:
-            metrics["latency_color"] = "success"  # Green (Fast)
-        elif latency_level < 7:
-            metrics["latency_color"] = "warning"  # Yellow (Acceptable)
-        else:
-            metrics["latency_color"] = "danger"  # Red (Slow)
-
-    # 4. Community Health Score Color (Percentage)
-    health_level = metrics["health_percentage"]
-    if health_level >= 80:
-        metrics["health_color"] = "success"  # Green (High Score)
-    elif health_level >= 50:
-        metrics["health_color"] = "warning"  # Yellow (Moderate Score)
-    else:
-        metrics["health_color"] = "danger"  # Red (Low Score)
-
-    # 5. Avg. Open Issue Age Color (Days)
-    issue_age_level = metrics["avg_issue_age_days"]
-    if isinstance(issue_age_level, (int, float)):
-        if issue_age_level < 30:
-            metrics["age_color"] = "success"  # Green (Young Issues)
-        elif issue_age_level < 90:
-            metrics["age_color"] = "warning"  # Yellow (Aging Backlog)
-        else:
-            metrics["age_color"] = "danger"  # Red (Stale Backlog)
+    # Anything GitHub failed to answer this time makes the result uncacheable
+    metrics.partial = (
+        metrics.open_issues == "N/A"
+        or any(
+            _nodes(repo, connection) is None
+            for connection in ("issues_closed", "issues_open", "pulls_closed")
+        )
+        or any(
+            _is_transient_failure(result) for result in (stats, contributors, community)
+        )
+    )
+
+    metrics.bus_factor_color = _color(metrics.bus_factor, BUS_FACTOR_COLORS)
+    metrics.response_time_color = _color(
+        metrics.avg_response_time_hours, RESPONSE_TIME_COLORS
+    )
+    metrics.latency_color = _color(metrics.avg_pr_latency_days, LATENCY_COLORS)
+    metrics.health_color = _color(metrics.health_percentage, HEALTH_COLORS)
+    metrics.age_color = _color(metrics.avg_issue_age_days, ISSUE_AGE_COLORS)
 
     return metrics
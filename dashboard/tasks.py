@@ -0,0 +1,39 @@
+import asyncio
+
+import msgspec
+from celery import shared_task
+from django.core.cache import cache
+
+from .services import Metrics, get_repo_health_metrics
+
+# Metrics are cached per repository for a day; ?refresh=1 forces a re-fetch
+CACHE_TTL_SECONDS = 60 * 60 * 24
+
+
+def metrics_cache_key(repo_name):
+    return f"repo_health:{repo_name.strip().lower()}"
+
+
+@shared_task
+def compute_metrics(repo_name):
+    """
+    Runs the full metrics pipeline for repo_name outside the request cycle
+    and caches the result for the dashboard to pick up.
+    """
+    data = asyncio.run(get_repo_health_metrics(repo_name))
+
+    # Errors (typos, rate limits) come back as plain dicts and are not cached
+    if not isinstance(data, Metrics):
+        return data
+
+    # Metrics with failed, skipped or still-computing parts are not worth
+    # remembering for a day
+    if not data.partial:
+        # Cached as JSON bytes; the view decodes them back into a dict
+        cache.set(
+            metrics_cache_key(repo_name),
+            msgspec.json.encode(data),
+            CACHE_TTL_SECONDS,
+        )
+
+    return msgspec.structs.asdict(data)
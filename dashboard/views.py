@@ -1,17 +1,59 @@
+import msgspec
+from asgiref.sync import sync_to_async
+from celery.result import AsyncResult
+from django.core.cache import cache
+from django.http import JsonResponse
 from django.shortcuts import render
-from .services import get_repo_health_metrics
+from .tasks import compute_metrics, metrics_cache_key
 
 
-def dashboard_home(request):
+def _job_result(job_id):
+    result = AsyncResult(job_id)
+    if not result.ready():
+        return None
+    if result.successful():
+        return result.result
+    return {"error": "Metrics computation failed unexpectedly. Please try again."}
+
+
+async def dashboard_home(request):
+    # Metrics are computed by a Celery worker; a cache miss renders a
+    # pending page that polls metrics_status until the job finishes.
     context = {}
 
     search_query = request.GET.get("repo")
+    job_id = request.GET.get("job")
 
     if search_query:
-        data = get_repo_health_metrics(search_query)
-        context["data"] = data
+        data = None
+
+        if job_id:
+            # Coming back from the pending page with a finished job
+            data = await sync_to_async(_job_result)(job_id)
+        if data is None and not request.GET.get("refresh"):
+            cached = await cache.aget(metrics_cache_key(search_query))
+            if cached is not None:
+                data = msgspec.json.decode(cached)
+
+        if data is None:
+            job = await sync_to_async(compute_metrics.delay)(search_query)
+            context["job_id"] = job.id
+        else:
+            context["data"] = data
+
         context["search_term"] = search_query
     else:
         context["search_term"] = ""
 
     return render(request, "index.html", context)
+
+
+def metrics_status(request, job_id):
+    result = AsyncResult(job_id)
+    return JsonResponse(
+        {
+            "status": result.status,
+            "ready": result.ready(),
+            "data": _job_result(job_id),
+        }
+    )